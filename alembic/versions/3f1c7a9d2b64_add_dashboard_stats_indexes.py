@@ -0,0 +1,45 @@
+"""add dashboard stats indexes on pipelines
+
+Revision ID: 3f1c7a9d2b64
+Revises: e9e5c0fd98fa
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f1c7a9d2b64"
+down_revision: str | Sequence[str] | None = "e9e5c0fd98fa"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Range scan for the "today" / "last 30 days" counters of /api/stats
+    op.create_index(
+        "ix_pipelines_created_at_status",
+        "pipelines",
+        ["created_at", "status"],
+        unique=False,
+    )
+    # Index-only scan for the average deploy time.
+    # Enum columns store the member NAME, hence 'SUCCESS'.
+    op.create_index(
+        "ix_pipelines_success_duration",
+        "pipelines",
+        ["duration_seconds"],
+        unique=False,
+        postgresql_where=sa.text("status = 'SUCCESS' AND duration_seconds IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pipelines_success_duration", table_name="pipelines")
+    op.drop_index("ix_pipelines_created_at_status", table_name="pipelines")
@@ -0,0 +1,50 @@
+"""maintain pull_requests.updated_at with a trigger
+
+Revision ID: 5d8e1b3c9f42
+Revises: c4a9e2f7d813
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d8e1b3c9f42"
+down_revision: str | Sequence[str] | None = "c4a9e2f7d813"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same DDL as the after_create hooks in src/models/entities.py.
+    # Stamps updated_at unless the UPDATE sets it explicitly...
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+        BEGIN
+            IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+                NEW.updated_at := now();
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # ...and only fires for UPDATEs that actually change the row.
+    op.execute(
+        """
+        CREATE TRIGGER pull_requests_set_updated_at
+        BEFORE UPDATE ON pull_requests
+        FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+        EXECUTE FUNCTION set_updated_at()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS pull_requests_set_updated_at ON pull_requests")
+    op.execute("DROP FUNCTION IF EXISTS set_updated_at()")
@@ -0,0 +1,60 @@
+"""add composite indexes for list queries
+
+Revision ID: 8b2d4e6f1a37
+Revises: 3f1c7a9d2b64
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2d4e6f1a37"
+down_revision: str | Sequence[str] | None = "3f1c7a9d2b64"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each composite index starts with the column of a single-column index,
+    # which becomes redundant and is dropped to save a write per INSERT.
+    op.create_index(
+        "ix_pull_requests_status_updated_at",
+        "pull_requests",
+        ["status", sa.text("updated_at DESC")],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_pull_requests_status"), table_name="pull_requests")
+
+    op.create_index(
+        "ix_pipeline_stages_pipeline_id_order",
+        "pipeline_stages",
+        ["pipeline_id", "order"],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_pipeline_stages_pipeline_id"), table_name="pipeline_stages")
+
+    op.create_index(
+        "ix_events_pull_request_id_created_at",
+        "events",
+        ["pull_request_id", sa.text("created_at DESC")],
+        unique=False,
+    )
+    op.drop_index(op.f("ix_events_pull_request_id"), table_name="events")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f("ix_events_pull_request_id"), "events", ["pull_request_id"], unique=False)
+    op.drop_index("ix_events_pull_request_id_created_at", table_name="events")
+
+    op.create_index(op.f("ix_pipeline_stages_pipeline_id"), "pipeline_stages", ["pipeline_id"], unique=False)
+    op.drop_index("ix_pipeline_stages_pipeline_id_order", table_name="pipeline_stages")
+
+    op.create_index(op.f("ix_pull_requests_status"), "pull_requests", ["status"], unique=False)
+    op.drop_index("ix_pull_requests_status_updated_at", table_name="pull_requests")
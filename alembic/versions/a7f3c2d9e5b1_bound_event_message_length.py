@@ -0,0 +1,46 @@
+"""bound events.message to varchar(1024) stored inline
+
+Revision ID: a7f3c2d9e5b1
+Revises: 5d8e1b3c9f42
+Create Date: 2026-10-15 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a7f3c2d9e5b1"
+down_revision: str | Sequence[str] | None = "5d8e1b3c9f42"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing longer messages are truncated rather than failing the migration
+    op.alter_column(
+        "events",
+        "message",
+        type_=sa.String(length=1024),
+        existing_type=sa.Text(),
+        existing_nullable=False,
+        postgresql_using="left(message, 1024)",
+    )
+    # MAIN: compress if needed, but keep the value in the row (no TOAST pointer)
+    op.execute("ALTER TABLE events ALTER COLUMN message SET STORAGE MAIN")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE events ALTER COLUMN message SET STORAGE EXTENDED")
+    op.alter_column(
+        "events",
+        "message",
+        type_=sa.Text(),
+        existing_type=sa.String(length=1024),
+        existing_nullable=False,
+    )
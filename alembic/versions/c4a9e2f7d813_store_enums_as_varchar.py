@@ -0,0 +1,109 @@
+"""store enums as varchar with check constraints
+
+Revision ID: c4a9e2f7d813
+Revises: 8b2d4e6f1a37
+Create Date: 2026-10-15 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9e2f7d813"
+down_revision: str | Sequence[str] | None = "8b2d4e6f1a37"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (table, column, PostgreSQL ENUM type, allowed values)
+# Native enums stored the member NAME ("SUCCESS"); the VARCHAR columns store
+# the member value ("success"), which is always the lowercased name.
+ENUM_COLUMNS = [
+    ("pull_requests", "status", "prstatus", ["open", "merged", "closed"]),
+    ("pipelines", "status", "pipelinestatus", ["pending", "running", "success", "failed", "cancelled"]),
+    ("pipeline_stages", "stage_type", "stagetype", ["lint", "test", "sonarqube", "build_image", "deploy"]),
+    ("pipeline_stages", "status", "stagestatus", ["pending", "running", "success", "failed", "skipped"]),
+    (
+        "environments",
+        "status",
+        "environmentstatus",
+        ["provisioning", "running", "degraded", "destroying", "destroyed", "failed"],
+    ),
+    (
+        "events",
+        "event_type",
+        "eventtype",
+        [
+            "pr_opened",
+            "pr_updated",
+            "pr_closed",
+            "pr_merged",
+            "pipeline_started",
+            "stage_started",
+            "stage_completed",
+            "stage_failed",
+            "env_provisioning",
+            "env_ready",
+            "env_destroying",
+            "env_destroyed",
+            "env_failed",
+        ],
+    ),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The partial index predicate compares against the enum type: drop it
+    # before the column changes type and recreate it with the new literal.
+    op.drop_index("ix_pipelines_success_duration", table_name="pipelines")
+
+    for table, column, enum_name, values in ENUM_COLUMNS:
+        op.alter_column(
+            table,
+            column,
+            type_=sa.String(length=20),
+            existing_type=sa.Enum(*(v.upper() for v in values), name=enum_name),
+            existing_nullable=False,
+            postgresql_using=f"lower({column}::text)",
+        )
+        allowed = ", ".join(f"'{v}'" for v in values)
+        op.create_check_constraint(f"ck_{table}_{column}", table, f"{column} IN ({allowed})")
+        op.execute(f"DROP TYPE {enum_name}")
+
+    op.create_index(
+        "ix_pipelines_success_duration",
+        "pipelines",
+        ["duration_seconds"],
+        unique=False,
+        postgresql_where=sa.text("status = 'success' AND duration_seconds IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_pipelines_success_duration", table_name="pipelines")
+
+    for table, column, enum_name, values in reversed(ENUM_COLUMNS):
+        enum_type = sa.Enum(*(v.upper() for v in values), name=enum_name)
+        enum_type.create(op.get_bind())
+        op.drop_constraint(f"ck_{table}_{column}", table, type_="check")
+        op.alter_column(
+            table,
+            column,
+            type_=enum_type,
+            existing_type=sa.String(length=20),
+            existing_nullable=False,
+            postgresql_using=f"upper({column})::{enum_name}",
+        )
+
+    op.create_index(
+        "ix_pipelines_success_duration",
+        "pipelines",
+        ["duration_seconds"],
+        unique=False,
+        postgresql_where=sa.text("status = 'SUCCESS' AND duration_seconds IS NOT NULL"),
+    )
@@ -1,8 +1,22 @@
 """SnapEnv — Ephemeral preview environments for every Pull Request."""
 
-from importlib.metadata import metadata
+from typing import Any
 
-_meta = metadata("SnapEnv")
+_METADATA_ATTRS = {"__version__": "Version", "__description__": "Summary"}
 
-__version__ = _meta["Version"]
-__description__ = _meta["Summary"]
+
+def __getattr__(name: str) -> Any:
+    """Resolve __version__ / __description__ on first access (PEP 562).
+
+    Reading the installed package metadata touches the disk, so it is only
+    done when something actually asks for it (e.g. the FastAPI app title),
+    not every time a worker or script imports the src package.
+    """
+    if name in _METADATA_ATTRS:
+        from importlib.metadata import metadata
+
+        meta = metadata("SnapEnv")
+        for attr, key in _METADATA_ATTRS.items():
+            globals()[attr] = meta[key]  # Cached: __getattr__ won't run again
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -11,15 +11,17 @@ from pathlib import Path
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from prometheus_fastapi_instrumentator import Instrumentator
+from starlette.types import ASGIApp
 
 from src import __description__, __version__
 from src.api.routes import dashboard, events, pipelines, pull_requests
 from src.api.routes.websocket import router as websocket_router
 from src.models.config import get_settings
-from src.models.database import init_db
+from src.models.database import get_ro_engine, init_db, warm_up_pool
 
 logger = structlog.get_logger()
 
@@ -34,27 +36,52 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """
     settings = get_settings()
     init_db()
+    try:
+        # Every route reads through get_ro_db, so only the read-only pool is
+        # warmed; the read-write pool (get_db) opens connections on demand.
+        await warm_up_pool(get_ro_engine(), min(settings.db_ro_pool_size, settings.db_pool_warm_up))
+    except Exception:
+        # Not fatal: connections will be opened on demand once the DB is reachable
+        logger.warning("db_pool_warm_up_failed", exc_info=True)
     app.title = settings.app_name
     logger.info("app_starting", app_name=settings.app_name, debug=settings.debug)
     yield
     logger.info("app_shutting_down")
 
 
+class SettingsCORSMiddleware(CORSMiddleware):
+    """CORSMiddleware allowing only the origins listed in settings.cors_origins.
+
+    Starlette instantiates middleware when it builds the middleware stack (on
+    the first ASGI event), so the settings are read then, not at import time.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        super().__init__(
+            app,
+            allow_origins=get_settings().cors_origins,
+            # The API uses no cookies, so credentials are never needed.
+            allow_credentials=False,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        )
+
+
+# ORJSONResponse: responses are encoded with orjson (C) instead of the stdlib json module.
 app = FastAPI(
     title="SnapEnv",
     version=__version__,
     description=__description__,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
-# WARNING: CORS: allow the frontend (dashboard) to call the API from a different origin.
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # TODO: restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS: only the configured origins may call the API from a different origin.
+app.add_middleware(SettingsCORSMiddleware)
+
+# Compress JSON responses (PR lists with nested pipelines/environments compress very well).
+# Small payloads are sent as-is: below ~500 bytes gzip costs more than it saves.
+app.add_middleware(GZipMiddleware, minimum_size=500)
 
 # Instrument the app with Prometheus metrics.
 # This adds a /metrics endpoint that Prometheus will scrape.
@@ -2,12 +2,23 @@
 
 Returns high-level metrics for the dashboard header:
 active environments count, success rate, average deploy time, etc.
+
+All metrics are computed in a single round-trip: each table is read once
+and the individual counters are derived with conditional aggregates
+(``count(*) FILTER (WHERE ...)`` in PostgreSQL). The WHERE clauses match the
+dashboard indexes declared on the models, so the reads are index range scans.
+
+The dashboard polls this endpoint every few seconds and the result is the
+same for every visitor, so it is cached in-process for a few seconds:
+concurrent requests on a cache miss share a single database hit.
 """
 
-from datetime import UTC, datetime, timedelta
+import asyncio
+import time
+from datetime import timedelta
 
 from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
+from sqlalchemy import func, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models import (
@@ -18,73 +29,129 @@ from src.models import (
     PRStatus,
     PullRequest,
 )
-from src.models.database import get_db
+from src.models.database import get_ro_db
 from src.schemas.api import PlatformStats
 
 router = APIRouter()
 
+# ── Stats cache ──────────────────────────────────────────
+# Stale-by-a-few-seconds stats are fine for a dashboard header.
+STATS_CACHE_TTL_SECONDS = 10.0
+
+_cached_stats: PlatformStats | None = None
+_cached_until: float = 0.0
+# Bumped by every invalidation: a computation that started before the bump may
+# predate the event that caused it, so its result must not be cached.
+_stats_generation = 0
+# Only one coroutine recomputes on a miss; the others wait and reuse its result.
+_stats_lock = asyncio.Lock()
+
+
+def invalidate_stats_cache() -> None:
+    """Drop the cached stats so the next request recomputes them."""
+    global _cached_stats, _cached_until, _stats_generation  # noqa: PLW0603
+    _cached_stats = None
+    _cached_until = 0.0
+    _stats_generation += 1
+
+
+def _get_cached_stats() -> PlatformStats | None:
+    """Return the cached stats if they have not expired yet."""
+    if _cached_stats is not None and time.monotonic() < _cached_until:
+        return _cached_stats
+    return None
+
 
 @router.get("/stats", response_model=PlatformStats)
 async def get_platform_stats(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_ro_db),
 ) -> PlatformStats:
-    """Aggregate platform statistics for the dashboard header."""
+    """Aggregate platform statistics for the dashboard header (cached for a few seconds)."""
+    global _cached_stats, _cached_until  # noqa: PLW0603
 
-    # Active environments (status = RUNNING)
-    active_envs = (
-        await db.scalar(
-            select(func.count(Environment.id)).where(Environment.status == EnvironmentStatus.RUNNING)
-        )
-        or 0
-    )
+    cached = _get_cached_stats()
+    if cached is not None:
+        return cached
 
-    # PR counts
-    total_prs = await db.scalar(select(func.count(PullRequest.id)))
-    open_prs = (
-        await db.scalar(select(func.count(PullRequest.id)).where(PullRequest.status == PRStatus.OPEN)) or 0
-    )
+    async with _stats_lock:
+        # Another request may have refreshed the cache while we were waiting.
+        cached = _get_cached_stats()
+        if cached is not None:
+            return cached
 
-    # Pipelines created today
-    today_start = datetime.now(UTC).replace(hour=0, minute=0, second=0, microsecond=0)
-    pipelines_today = (
-        await db.scalar(select(func.count(Pipeline.id)).where(Pipeline.created_at >= today_start)) or 0
-    )
+        generation = _stats_generation
+        stats = await _compute_platform_stats(db)
+        # Invalidated while the query ran: return these numbers to this request,
+        # but don't serve them to others for a whole TTL.
+        if generation == _stats_generation:
+            _cached_stats = stats
+            _cached_until = time.monotonic() + STATS_CACHE_TTL_SECONDS
 
-    # Success rate over the last 30 days
-    thirty_days_ago = datetime.now(UTC) - timedelta(days=30)
-    total_finished = (
-        await db.scalar(
-            select(func.count(Pipeline.id)).where(
-                Pipeline.created_at >= thirty_days_ago,
-                Pipeline.status.in_([PipelineStatus.SUCCESS, PipelineStatus.FAILED]),
-            )
-        )
-        or 0
+    return stats
+
+
+async def _compute_platform_stats(db: AsyncSession) -> PlatformStats:
+    """Run the aggregate query and build the PlatformStats response."""
+    # Time windows are computed by PostgreSQL from its own clock. Both are stable
+    # expressions, evaluated once per query, so they still drive index range scans.
+    today_start = func.date_trunc("day", func.now(), "UTC")  # Midnight UTC today
+    thirty_days_ago = func.now() - timedelta(days=30)
+
+    # Active environments (status = RUNNING)
+    env_stats = (
+        select(func.count().label("active_envs"))
+        .where(Environment.status == EnvironmentStatus.RUNNING)
+        .cte("env_stats")
     )
-    total_success = (
-        await db.scalar(
-            select(func.count(Pipeline.id)).where(
-                Pipeline.created_at >= thirty_days_ago,
-                Pipeline.status == PipelineStatus.SUCCESS,
-            )
+
+    # PR counts: total and open, from a single scan of pull_requests
+    pr_stats = select(
+        func.count().label("total_prs"),
+        func.count().filter(PullRequest.status == PRStatus.OPEN).label("open_prs"),
+    ).cte("pr_stats")
+
+    # Recent pipeline metrics, from one index range scan over the last 30 days:
+    # - pipelines created today
+    # - finished / successful pipelines over the last 30 days (success rate)
+    recent_pipeline_stats = (
+        select(
+            func.count().filter(Pipeline.created_at >= today_start).label("pipelines_today"),
+            func.count()
+            .filter(Pipeline.status.in_([PipelineStatus.SUCCESS, PipelineStatus.FAILED]))
+            .label("total_finished"),
+            func.count().filter(Pipeline.status == PipelineStatus.SUCCESS).label("total_success"),
         )
-        or 0
+        .where(Pipeline.created_at >= thirty_days_ago)
+        .cte("recent_pipeline_stats")
     )
-    success_rate = (total_success / total_finished * 100) if total_finished > 0 else 0.0
 
-    # Average deploy time (successful pipelines only)
-    avg_duration = await db.scalar(
-        select(func.avg(Pipeline.duration_seconds)).where(
+    # Average deploy time (successful pipelines only, served by a partial index)
+    duration_stats = (
+        select(func.avg(Pipeline.duration_seconds).label("avg_duration"))
+        .where(
             Pipeline.status == PipelineStatus.SUCCESS,
             Pipeline.duration_seconds.isnot(None),
         )
+        .cte("duration_stats")
     )
 
+    # Each CTE yields exactly one row, so joining them ON true still yields a single row.
+    query = (
+        select(env_stats, pr_stats, recent_pipeline_stats, duration_stats)
+        .select_from(env_stats)
+        .join(pr_stats, true())
+        .join(recent_pipeline_stats, true())
+        .join(duration_stats, true())
+    )
+    stats = (await db.execute(query)).one()
+
+    success_rate = (stats.total_success / stats.total_finished * 100) if stats.total_finished > 0 else 0.0
+
     return PlatformStats(
-        active_environments=active_envs,
-        total_pull_requests=total_prs,
-        open_pull_requests=open_prs,
-        pipelines_today=pipelines_today,
+        active_environments=stats.active_envs,
+        total_pull_requests=stats.total_prs,
+        open_pull_requests=stats.open_prs,
+        pipelines_today=stats.pipelines_today,
         success_rate_percent=round(success_rate, 1),
-        avg_deploy_time_seconds=round(avg_duration, 1) if avg_duration else None,
+        avg_deploy_time_seconds=round(stats.avg_duration, 1) if stats.avg_duration else None,
     )
@@ -5,24 +5,47 @@ The WebSocket endpoint streams events in real time to the dashboard.
 """
 
 import asyncio
-import json
 from typing import Any
+from uuid import UUID
 
+import orjson
 import structlog
-from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, Query, Response, WebSocket
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.routes.dashboard import invalidate_stats_cache
 from src.models import Event
-from src.models.database import get_db
-from src.schemas.api import EventResponse
+from src.models.database import get_ro_db
+from src.schemas.api import EVENT_LIST_ADAPTER, EventResponse
 
 logger = structlog.get_logger()
 router = APIRouter()
 
-# In-memory set of connected WebSocket clients.
+# In-memory registry of connected WebSocket clients.
 # For production with multiple workers, could be replaced with Redis pub/sub.
-connected_clients: set[WebSocket] = set()
+#
+# Each client gets a bounded outbox drained by its own writer task, so a
+# broadcast never waits on the network: it only enqueues the message.
+# A client that falls CLIENT_QUEUE_SIZE messages behind is disconnected
+# instead of applying back-pressure to everyone else.
+CLIENT_QUEUE_SIZE = 100
+
+# None is the "close this connection" sentinel.
+connected_clients: dict[WebSocket, asyncio.Queue[str | None]] = {}
+
+
+async def _client_writer(websocket: WebSocket, queue: asyncio.Queue[str | None]) -> None:
+    """Forward queued messages to one client until it is closed or fails."""
+    try:
+        while (message := await queue.get()) is not None:
+            await websocket.send_text(message)
+        # The client overflowed its outbox: 1013 = "try again later"
+        await websocket.close(code=1013)
+    except Exception:
+        logger.info("websocket_send_failed")
+    finally:
+        connected_clients.pop(websocket, None)
 
 
 async def broadcast_event(event_data: dict[str, Any]) -> None:
@@ -30,36 +53,48 @@ async def broadcast_event(event_data: dict[str, Any]) -> None:
 
     Called by the Celery worker (via an intermediary) whenever
     a state change occurs (pipeline stage completed, env ready, etc.).
+
+    The payload is serialized once (with orjson, which natively handles
+    datetime, UUID and enum values) and enqueued for every client;
+    the per-client writer tasks do the actual sends.
     """
-    disconnected = set()
-    message = json.dumps(event_data, default=str)
+    # Every event is a state change: the next /api/stats call must not serve
+    # numbers from before it (instead of waiting out the cache TTL).
+    invalidate_stats_cache()
+    message = orjson.dumps(event_data).decode()
 
-    for ws in connected_clients:
+    # Snapshot: writers remove their client from the registry when they stop
+    for websocket, queue in list(connected_clients.items()):
         try:
-            await ws.send_text(message)
-        except Exception:
-            disconnected.add(ws)
-
-    # Clean up dead connections
-    connected_clients.difference_update(disconnected)
+            queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too slow: drop its backlog and ask its writer to close the connection
+            connected_clients.pop(websocket, None)
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait(None)
+            logger.warning("websocket_client_too_slow")
 
 
 @router.get("", response_model=list[EventResponse])
 async def list_events(
     limit: int = Query(50, ge=1, le=200),
-    pull_request_id: str | None = None,
-    db: AsyncSession = Depends(get_db),
-) -> list[EventResponse]:
+    pull_request_id: UUID | None = None,
+    db: AsyncSession = Depends(get_ro_db),
+) -> Response:
     """Get recent events, optionally filtered by pull request."""
     query = select(Event).order_by(Event.created_at.desc()).limit(limit)
 
     if pull_request_id:
         query = query.where(Event.pull_request_id == pull_request_id)
 
-    result = await db.execute(query)
-    events = result.scalars().all()
+    # The page is small (LIMIT <= 200): fetch it in one round trip, then
+    # validate the whole page in one call to pydantic-core.
+    rows = (await db.scalars(query)).all()
 
-    return [EventResponse.model_validate(e) for e in events]
+    # Serialized straight to JSON bytes, like the PR list (see pull_requests.py)
+    items = EVENT_LIST_ADAPTER.validate_python(rows, from_attributes=True)
+    return Response(EVENT_LIST_ADAPTER.dump_json(items), media_type="application/json")
 
 
 @router.websocket("/ws")
@@ -70,15 +105,20 @@ async def event_websocket(websocket: WebSocket) -> None:
     as events are created (PR opened, pipeline stage completed, etc.).
     """
     await websocket.accept()
-    connected_clients.add(websocket)
+    queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+    connected_clients[websocket] = queue
+    writer = asyncio.create_task(_client_writer(websocket, queue))
     logger.info("websocket_connected", total_clients=len(connected_clients))
 
     try:
+        # Only wait for the close frame: dead clients are detected by the
+        # server's protocol-level PING/PONG (uvicorn --ws-ping-interval /
+        # --ws-ping-timeout), so no application-level timeout is needed.
         while True:
-            # Keep connection alive; client can send pings or messages
-            await asyncio.wait_for(websocket.receive_text(), timeout=60.0)
-    except (TimeoutError, WebSocketDisconnect):
-        pass
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
     finally:
-        connected_clients.discard(websocket)
+        writer.cancel()
+        connected_clients.pop(websocket, None)
         logger.info("websocket_disconnected", total_clients=len(connected_clients))
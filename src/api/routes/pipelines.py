@@ -1,12 +1,14 @@
 """Pipeline API endpoints."""
 
+from uuid import UUID
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from src.models import Pipeline
-from src.models.database import get_db
+from src.models.database import get_ro_db
 from src.schemas.api import PipelineResponse
 
 router = APIRouter()
@@ -14,8 +16,8 @@ router = APIRouter()
 
 @router.get("/{pipeline_id}", response_model=PipelineResponse)
 async def get_pipeline(
-    pipeline_id: str,
-    db: AsyncSession = Depends(get_db),
+    pipeline_id: UUID,
+    db: AsyncSession = Depends(get_ro_db),
 ) -> PipelineResponse:
     """Get detailed pipeline information including all stages and their results."""
     query = select(Pipeline).options(selectinload(Pipeline.stages)).where(Pipeline.id == pipeline_id)
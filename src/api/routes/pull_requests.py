@@ -2,17 +2,19 @@
 
 These endpoints power the dashboard's PR list and detail views.
 Each endpoint receives a database session via FastAPI's dependency injection
-(the `db: AsyncSession = Depends(get_db)` parameter).
+(the `db: AsyncSession = Depends(get_ro_db)` parameter).
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import joinedload, selectinload
 
 from src.models import PRStatus, PullRequest
-from src.models.database import get_db
-from src.schemas.api import PullRequestListItem, PullRequestResponse
+from src.models.database import get_ro_db
+from src.schemas.api import PR_LIST_ADAPTER, PullRequestListItem, PullRequestResponse
 
 router = APIRouter()
 
@@ -22,8 +24,8 @@ async def list_pull_requests(
     status_filter: PRStatus | None = Query(None, alias="status"),
     limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
-    db: AsyncSession = Depends(get_db),
-) -> list[PullRequestListItem]:
+    db: AsyncSession = Depends(get_ro_db),
+) -> Response:
     """List all tracked pull requests with their latest pipeline status.
 
     Query parameters:
@@ -32,12 +34,14 @@ async def list_pull_requests(
     - offset: pagination offset
     """
     # selectinload tells SQLAlchemy to fetch related objects in a single query
-    # instead of making a separate query for each PR's environment/pipelines
+    # instead of making a separate query for each PR's environment/pipeline.
+    # latest_pipeline is resolved by PostgreSQL (DISTINCT ON), so only one
+    # pipeline row per PR is transferred instead of the whole history.
     query = (
         select(PullRequest)
         .options(
             selectinload(PullRequest.environment),
-            selectinload(PullRequest.pipelines),
+            selectinload(PullRequest.latest_pipeline),
         )
         .order_by(PullRequest.updated_at.desc())
         .offset(offset)
@@ -50,44 +54,29 @@ async def list_pull_requests(
     result = await db.execute(query)
     prs = result.scalars().all()
 
-    # Build response items with the latest pipeline extracted
-    items = []
-    for pr in prs:
-        latest_pipeline = pr.pipelines[0] if pr.pipelines else None
-        items.append(
-            PullRequestListItem(
-                id=pr.id,
-                github_pr_number=pr.github_pr_number,
-                repository=pr.repository,
-                title=pr.title,
-                author=pr.author,
-                branch=pr.branch,
-                status=pr.status,
-                preview_url=pr.preview_url,
-                latest_commit_sha=pr.latest_commit_sha,
-                created_at=pr.created_at,
-                updated_at=pr.updated_at,
-                environment=pr.environment,
-                latest_pipeline=latest_pipeline,
-            )
-        )
-
-    return items
+    # Serialize straight to JSON bytes: returning a Response skips FastAPI's
+    # second validation pass and dict conversion (response_model is kept for
+    # the OpenAPI docs only).
+    items = PR_LIST_ADAPTER.validate_python(prs, from_attributes=True)
+    return Response(PR_LIST_ADAPTER.dump_json(items), media_type="application/json")
 
 
 @router.get("/{pr_id}", response_model=PullRequestResponse)
 async def get_pull_request(
-    pr_id: str,
-    db: AsyncSession = Depends(get_db),
+    pr_id: UUID,
+    db: AsyncSession = Depends(get_ro_db),
 ) -> PullRequestResponse:
     """Get detailed information about a specific pull request.
 
     Includes the full pipeline history and environment status.
     """
+    # One row, so the 1:1 environment rides along in the same query (LEFT JOIN);
+    # the pipelines (1:N) come from a second WHERE IN query. Stages are not
+    # loaded: PipelineSummary doesn't include them.
     query = (
         select(PullRequest)
         .options(
-            selectinload(PullRequest.environment),
+            joinedload(PullRequest.environment),
             selectinload(PullRequest.pipelines),
         )
         .where(PullRequest.id == pr_id)
@@ -22,6 +22,8 @@ from typing import Any
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 
+from src.api.routes.dashboard import invalidate_stats_cache
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
@@ -128,4 +130,6 @@ async def broadcast_event(
     if extra:
         payload.update(extra)
 
+    # Something changed: don't let /api/stats serve pre-event numbers until its TTL expires
+    invalidate_stats_cache()
     await manager.broadcast(payload)
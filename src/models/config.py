@@ -36,6 +36,10 @@ class Settings(BaseSettings):
     preview_domain: str = "preview.localhost"
     debug: bool = False
     log_level: str = "INFO"
+    # Browser origins allowed to call the API cross-origin (CORS), as a JSON list:
+    # CORS_ORIGINS='["https://dashboard.example.com"]'. The dashboard is served
+    # by the API itself (same origin), so none are needed by default.
+    cors_origins: list[str] = []
 
     # ── Database ──────────────────────────────────────────
     postgres_host: str = "localhost"
@@ -44,6 +48,23 @@ class Settings(BaseSettings):
     postgres_password: str
     postgres_db: str = "preview_platform"
 
+    # ── Connection pool ───────────────────────────────────
+    # Tune per deployment: a laptop needs a handful of connections, a busy
+    # production API more (keep replicas × (size + overflow) under the
+    # server's max_connections).
+    db_pool_size: int = 20  # Connections kept open
+    db_max_overflow: int = 10  # Extra connections allowed during peaks
+    db_pool_timeout: int = 10  # Seconds to wait for a free connection
+    # Connections the read-only pool opens at startup (capped at its pool size).
+    # Kept small: every uvicorn worker warms its own pool against max_connections.
+    db_pool_warm_up: int = 4
+
+    # ── Read-only engine (GET endpoints) ──────────────────
+    # Optional replica URL (postgresql+asyncpg://...). When unset, reads go to
+    # the primary database, still through their own read-only pool.
+    read_database_url: str | None = None
+    db_ro_pool_size: int = 10
+
     @property
     def database_url(self) -> str:
         """Async connection URL (used by the FastAPI app).
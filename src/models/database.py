@@ -3,14 +3,16 @@
 This module configures:
 1. The "engine": the connection to PostgreSQL (connection pool)
 2. The "session factory": creates sessions to interact with the DB
-3. The FastAPI dependency get_db(): injects a session into each endpoint
+3. The FastAPI dependencies get_db() / get_ro_db(): inject a session into
+   each endpoint (read-write / read-only)
 
 Lazy initialisation
 ~~~~~~~~~~~~~~~~~~~
-The engine and session factory are created on first use (via ``init_db``),
-**not** at import time.  This avoids requiring database credentials just to
-import the module — critical for test suites that override the dependency
-and for CLI tooling that never touches the DB.
+The engine and session factory are created on first use (``get_engine`` /
+``get_session_factory``, memoized with ``lru_cache``), **not** at import
+time.  This avoids requiring database credentials just to import the
+module — critical for test suites that override the dependency and for
+CLI tooling that never touches the DB.
 
 API request flow:
     HTTP request → FastAPI → get_db() opens a session
@@ -19,28 +21,31 @@ API request flow:
     → the session is closed
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
+from functools import lru_cache
 
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
 from src.models.config import get_settings
 
 # ── Lazy singletons ──────────────────────────────────────
+# @lru_cache turns each getter into a singleton: the first call builds the
+# object, later calls (one per request via get_db) return the cached one.
 
-_engine: AsyncEngine | None = None
-_async_session_factory: async_sessionmaker[AsyncSession] | None = None
-
-
-def init_db() -> None:
-    """Create the engine and session factory from current settings.
-
-    Called once during the application lifespan startup.
-    Credentials are validated here — if they are missing the app
-    fails fast with a clear Pydantic error at startup, not at import.
-    """
-    global _engine, _async_session_factory  # noqa: PLW0603
 
+def _create_engine(url: str, *, pool_size: int, read_only: bool = False) -> AsyncEngine:
+    """Build an engine with the shared pool/driver options."""
     settings = get_settings()
+    server_settings = {
+        # JIT compilation only pays off for long analytical queries; for the
+        # API's millisecond lookups its startup cost is pure overhead.
+        "jit": "off",
+    }
+    if read_only:
+        # PostgreSQL itself rejects any write issued through this engine
+        server_settings["default_transaction_read_only"] = "on"
 
     # ── Engine ────────────────────────────────────────────
     # The engine is the connection point to PostgreSQL.
@@ -48,39 +53,117 @@ def init_db() -> None:
     # When the app needs the DB, it borrows a connection from the pool,
     # uses it, and returns it. This avoids opening/closing a TCP connection
     # for every request (expensive).
-    _engine = create_async_engine(
-        settings.database_url,
+    return create_async_engine(
+        url,
         echo=settings.debug,  # If debug=True, prints SQL queries in logs
-        pool_size=20,  # Number of connections kept open
-        max_overflow=10,  # Extra connections for peak load (total max = 30)
+        # Pool sizing comes from settings (DB_POOL_SIZE, ...) so each deployment can tune it
+        pool_size=pool_size,  # Number of connections kept open
+        max_overflow=settings.db_max_overflow,  # Extra connections for peak load
         pool_pre_ping=True,  # Checks that the connection is alive before using it
+        pool_timeout=settings.db_pool_timeout,  # Seconds to wait for a free connection
+        # Replace connections older than 30 min before server/proxy idle timeouts
+        # close them, so pre_ping rarely has to discard a dead one.
+        pool_recycle=1800,
+        # Hand out the most recently returned connection first: under normal load
+        # the same few warm connections serve most requests, and the extras go idle.
+        pool_use_lifo=True,
+        # Compiled-SQL LRU cache (default 500 entries). Every endpoint builds its
+        # select() per request; limit/offset/filters are bound parameters, so each
+        # query shape compiles once. The headroom keeps eager-load variants cached too.
+        query_cache_size=1200,
+        connect_args={
+            # Per-connection LRU of asyncpg prepared statements (default 100):
+            # a repeated query skips the parse/plan round trip. Sized to hold
+            # every query shape the API issues.
+            "prepared_statement_cache_size": 512,
+            "server_settings": server_settings,
+        },
     )
 
+
+@lru_cache(maxsize=1)
+def get_engine() -> AsyncEngine:
+    """Return the read-write engine, creating it from current settings on first call."""
+    settings = get_settings()
+    return _create_engine(settings.database_url, pool_size=settings.db_pool_size)
+
+
+@lru_cache(maxsize=1)
+def get_ro_engine() -> AsyncEngine:
+    """Return the read-only engine used by GET endpoints.
+
+    It has its own (smaller) pool, so slow dashboard reads can never take
+    all the connections that writes need. It points at READ_DATABASE_URL
+    (e.g. a replica) when set, otherwise at the primary database.
+    """
+    settings = get_settings()
+    return _create_engine(
+        settings.read_database_url or settings.database_url,
+        pool_size=settings.db_ro_pool_size,
+        read_only=True,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the session factory, creating it (and the engine) on first call."""
     # ── Session factory ───────────────────────────────────
     # A session = a "transaction" with the DB.
     # The factory creates sessions configured the same way.
     # expire_on_commit=False: after a commit, Python objects remain
     # usable (without this, accessing pr.title after a commit would trigger
     # an additional SQL query).
-    _async_session_factory = async_sessionmaker(
-        _engine,
+    return async_sessionmaker(
+        get_engine(),
         class_=AsyncSession,
         expire_on_commit=False,
     )
 
 
-def get_engine() -> AsyncEngine:
-    """Return the current engine, raising if ``init_db`` was not called."""
-    if _engine is None:
-        raise RuntimeError("Database not initialised. Call init_db() first (see app lifespan).")
-    return _engine
+@lru_cache(maxsize=1)
+def get_ro_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Return the session factory bound to the read-only engine."""
+    return async_sessionmaker(
+        get_ro_engine(),
+        class_=AsyncSession,
+        expire_on_commit=False,
+    )
 
 
-def get_session_factory() -> async_sessionmaker[AsyncSession]:
-    """Return the current session factory, raising if ``init_db`` was not called."""
-    if _async_session_factory is None:
-        raise RuntimeError("Database not initialised. Call init_db() first (see app lifespan).")
-    return _async_session_factory
+def init_db() -> None:
+    """Create the engines and session factories from current settings.
+
+    Called once during the application lifespan startup.
+    Credentials are validated here — if they are missing the app
+    fails fast with a clear Pydantic error at startup, not at import.
+    """
+    get_session_factory()
+    get_ro_session_factory()
+
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> None:
+    """Open ``connections`` pooled connections on ``engine`` before the first request arrives.
+
+    Called during the application lifespan startup, right after ``init_db``,
+    for the read-only engine (the one every GET route uses). Without it, the
+    first burst of requests would all race to open TCP connections (and
+    authenticate) at the same time. Every connection is
+    held until all of them are open, so the pool really ends up with
+    ``connections`` distinct warm sockets. Keep ``connections`` small: each
+    worker process warms its own pool against the server's max_connections.
+    """
+    if connections <= 0:
+        return
+    all_open = asyncio.Barrier(connections)
+
+    async def _open_one() -> None:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            await all_open.wait()
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(connections):
+            tg.create_task(_open_one())
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -100,20 +183,20 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     - Automatic rollback on error
     """
     session_factory = get_session_factory()
-    async with session_factory() as session:
-        try:
-            # Pause here and give the session to the FastAPI endpoint.
-            # Execution of this function will resume AFTER the endpoint finishes.
-            yield session
-
-            # This runs only if the endpoint completed successfully.
-            # "await" suspends execution until the commit operation is fully done.
-            await session.commit()
-
-        except Exception:
-            # If the endpoint raised an error, execution resumes here.
-            # "await" ensures the rollback completes before continuing.
-            await session.rollback()
-
-            # Re-raise the original exception so FastAPI can handle it properly.
-            raise
+    # The outer block closes the session (returning its connection to the pool).
+    # session.begin() opens the transaction and, when the block exits,
+    # commits it — or rolls it back if the endpoint raised, re-raising the error.
+    async with session_factory() as session, session.begin():
+        # Pause here and give the session to the FastAPI endpoint.
+        # Execution of this function will resume AFTER the endpoint finishes.
+        yield session
+
+
+async def get_ro_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency that provides a read-only database session.
+
+    Same as get_db() but on the read-only engine, for GET endpoints.
+    There is nothing to commit: closing the session ends the transaction.
+    """
+    async with get_ro_session_factory()() as session:
+        yield session
@@ -12,21 +12,28 @@ PullRequest (the GitHub PR we track)
 """
 
 import enum
+import uuid
 from datetime import datetime
-from typing import Any
-from uuid import uuid4
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from sqlalchemy import (
+    DDL,
+    CheckConstraint,
     DateTime,
-    Enum,
+    Dialect,
+    FetchedValue,
     ForeignKey,
+    Index,
     Integer,
     String,
-    Text,
     func,
+    select,
+    text,
 )
+from sqlalchemy import event as sa_event
 from sqlalchemy.dialects.postgresql import JSONB, UUID
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.orm import DeclarativeBase, Mapped, aliased, mapped_column, relationship
+from sqlalchemy.types import TypeDecorator
 
 # ──────────────────────────────────────────────────────────────
 # Base
@@ -122,6 +129,56 @@ class EventType(str, enum.Enum):
     ENV_FAILED = "env_failed"
 
 
+# ──────────────────────────────────────────────────────────────
+# Enum columns
+# ──────────────────────────────────────────────────────────────
+
+_E = TypeVar("_E", bound=enum.Enum)
+
+
+class EnumString(TypeDecorator[_E]):
+    """Store a Python enum as its string value in a plain VARCHAR column.
+
+    Native PostgreSQL ENUM types need an ALTER TYPE (and its exclusive lock)
+    for every new value, and compare through an OID lookup. Here the database
+    only sees text (e.g. "success"); the Python side still gets enum members,
+    and a CHECK constraint (see enum_check) keeps the column values valid.
+    """
+
+    impl = String(20)
+    cache_ok = True
+
+    def __init__(self, enum_class: type[_E]) -> None:
+        super().__init__()
+        self.enum_class = enum_class
+        # Lookup tables built once per column type, so converting a row is a
+        # single dict hit instead of an Enum(value) call.
+        self._from_db: dict[str, _E] = {str(member.value): member for member in enum_class}
+        self._to_db: dict[_E | str, str] = {member: str(member.value) for member in enum_class}
+        self._to_db.update({db_value: db_value for db_value in self._from_db})
+
+    def process_bind_param(self, value: _E | str | None, dialect: Dialect) -> str | None:
+        """Enum member (or its raw value) → stored string. Rejects unknown values."""
+        if value is None:
+            return None
+        try:
+            return self._to_db[value]
+        except KeyError:
+            raise ValueError(f"{value!r} is not a valid {self.enum_class.__name__}") from None
+
+    def process_result_value(self, value: str | None, dialect: Dialect) -> _E | None:
+        """Stored string → enum member."""
+        if value is None:
+            return None
+        return self._from_db[value]
+
+
+def enum_check(table: str, column: str, enum_class: type[enum.Enum]) -> CheckConstraint:
+    """CHECK constraint limiting an EnumString column to the enum's values."""
+    values = ", ".join(f"'{member.value}'" for member in enum_class)
+    return CheckConstraint(f"{column} IN ({values})", name=f"ck_{table}_{column}")
+
+
 # ──────────────────────────────────────────────────────────────
 # Models (Tables)
 # ──────────────────────────────────────────────────────────────
@@ -141,14 +198,25 @@ class PullRequest(Base):
 
     __tablename__ = "pull_requests"  # Table name in PostgreSQL
 
+    # ── Composite index ──
+    # Dashboard lists filter by status and sort by most recent activity:
+    # (status, updated_at DESC) serves both with one range scan, no sort step.
+    # It also covers status-only lookups, so status has no index of its own.
+    __table_args__ = (
+        Index("ix_pull_requests_status_updated_at", "status", text("updated_at DESC")),
+        enum_check("pull_requests", "status", PRStatus),
+    )
+
     # ── Primary key ──
     # We use UUIDs instead of auto-increment (1, 2, 3...)
     # Advantages: no collision when merging databases, no info
     # about total records, works in distributed setups.
-    id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False),
+    # as_uuid=True maps the native 16-byte uuid column to uuid.UUID, so no
+    # 36-character string is built for each row.
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         primary_key=True,
-        default=lambda: str(uuid4()),  # Automatically generates a UUID
+        default=uuid.uuid4,  # Automatically generates a UUID
     )
 
     # ── PR data ──
@@ -161,8 +229,8 @@ class PullRequest(Base):
     branch: Mapped[str] = mapped_column(String(255))
     base_branch: Mapped[str] = mapped_column(String(255), default="main")
 
-    # Enum(PRStatus) creates a PostgreSQL ENUM type with values "open", "merged", "closed"
-    status: Mapped[PRStatus] = mapped_column(Enum(PRStatus), default=PRStatus.OPEN, index=True)
+    # EnumString(PRStatus) stores "open", "merged" or "closed" as plain text
+    status: Mapped[PRStatus] = mapped_column(EnumString(PRStatus), default=PRStatus.OPEN)
 
     # str | None = this column can be NULL (no URL before deployment)
     preview_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
@@ -178,12 +246,19 @@ class PullRequest(Base):
     )
     # server_default=func.now() → default value is computed by PostgreSQL
 
+    # Maintained by a PostgreSQL trigger (see _SET_UPDATED_AT below), which only
+    # touches rows whose values actually changed. FetchedValue() tells the ORM
+    # the database changes it on UPDATE, so it's read back instead of sent.
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
-        onupdate=func.now(),  # Automatically updated on each UPDATE
+        server_onupdate=FetchedValue(),
     )
 
+    # Read updated_at back with RETURNING right after an UPDATE (async code can't
+    # lazy-load an expired attribute later)
+    __mapper_args__ = {"eager_defaults": True}
+
     # ── Relationships ──
 
     pipelines: Mapped[list["Pipeline"]] = relationship(
@@ -192,6 +267,11 @@ class PullRequest(Base):
         order_by="Pipeline.created_at.desc()",  # Sorted by descending creation date
     )
 
+    # Read-only shortcut to the most recent pipeline, attached at the bottom
+    # of this module once Pipeline exists (see _LatestPipeline).
+    if TYPE_CHECKING:
+        latest_pipeline: Mapped["Pipeline | None"]
+
     environment: Mapped["Environment | None"] = relationship(
         back_populates="pull_request",
         cascade="all, delete-orphan",
@@ -218,21 +298,35 @@ class Pipeline(Base):
 
     __tablename__ = "pipelines"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4()))
+    # ── Dashboard indexes ──
+    # Match the predicates of the /api/stats query so it never seq-scans pipelines:
+    # - (created_at, status): index-only range scan for "today" / "last 30 days" counts
+    # - partial index on duration_seconds: index-only scan for the average deploy time
+    __table_args__ = (
+        Index("ix_pipelines_created_at_status", "created_at", "status"),
+        Index(
+            "ix_pipelines_success_duration",
+            "duration_seconds",
+            postgresql_where=text("status = 'success' AND duration_seconds IS NOT NULL"),
+        ),
+        enum_check("pipelines", "status", PipelineStatus),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
 
     # ── Foreign key ──
     # Links this pipeline to a PullRequest.
     # ForeignKey("pull_requests.id") references the "id" column of the "pull_requests" table
     # ondelete="CASCADE": if the PR is deleted, its pipelines are also deleted
-    pull_request_id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False),
+    pull_request_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("pull_requests.id", ondelete="CASCADE"),
         index=True,
     )
 
     commit_sha: Mapped[str] = mapped_column(String(40))
     status: Mapped[PipelineStatus] = mapped_column(
-        Enum(PipelineStatus), default=PipelineStatus.PENDING, index=True
+        EnumString(PipelineStatus), default=PipelineStatus.PENDING, index=True
     )
 
     # GitHub Actions workflow run ID (for polling)
@@ -260,7 +354,7 @@ class Pipeline(Base):
     )
 
     def __repr__(self) -> str:
-        return f"<Pipeline {self.id[:8]} [{self.status.value}]>"
+        return f"<Pipeline {str(self.id)[:8]} [{self.status.value}]>"
 
 
 class PipelineStage(Base):
@@ -273,15 +367,22 @@ class PipelineStage(Base):
 
     __tablename__ = "pipeline_stages"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4()))
-    pipeline_id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False),
+    # Stages are always read per pipeline in execution order (Pipeline.stages),
+    # so (pipeline_id, order) returns them pre-sorted. It also serves the FK.
+    __table_args__ = (
+        Index("ix_pipeline_stages_pipeline_id_order", "pipeline_id", "order"),
+        enum_check("pipeline_stages", "stage_type", StageType),
+        enum_check("pipeline_stages", "status", StageStatus),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    pipeline_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("pipelines.id", ondelete="CASCADE"),
-        index=True,
     )
 
-    stage_type: Mapped[StageType] = mapped_column(Enum(StageType))
-    status: Mapped[StageStatus] = mapped_column(Enum(StageStatus), default=StageStatus.PENDING)
+    stage_type: Mapped[StageType] = mapped_column(EnumString(StageType))
+    status: Mapped[StageStatus] = mapped_column(EnumString(StageStatus), default=StageStatus.PENDING)
     # order = position in the pipeline (1=lint, 2=test, 3=sonar, etc.)
     order: Mapped[int] = mapped_column(Integer)
 
@@ -318,9 +419,11 @@ class Environment(Base):
 
     __tablename__ = "environments"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4()))
-    pull_request_id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False),
+    __table_args__ = (enum_check("environments", "status", EnvironmentStatus),)
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    pull_request_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("pull_requests.id", ondelete="CASCADE"),
         unique=True,  # Only one environment per PR (1:1 relation)
         index=True,
@@ -331,7 +434,7 @@ class Environment(Base):
 
     url: Mapped[str] = mapped_column(String(500))
     status: Mapped[EnvironmentStatus] = mapped_column(
-        Enum(EnvironmentStatus),
+        EnumString(EnvironmentStatus),
         default=EnvironmentStatus.PROVISIONING,
         index=True,
     )
@@ -368,10 +471,19 @@ class Event(Base):
 
     __tablename__ = "events"
 
-    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True, default=lambda: str(uuid4()))
-    event_type: Mapped[EventType] = mapped_column(Enum(EventType), index=True)
-    # Text = SQL TEXT (no length limit, unlike VARCHAR)
-    message: Mapped[str] = mapped_column(Text)
+    # The per-PR event feed filters by PR and sorts newest first:
+    # (pull_request_id, created_at DESC) serves it without a sort step,
+    # and also covers the FK, so pull_request_id has no index of its own.
+    __table_args__ = (
+        Index("ix_events_pull_request_id_created_at", "pull_request_id", text("created_at DESC")),
+        enum_check("events", "event_type", EventType),
+    )
+
+    id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    event_type: Mapped[EventType] = mapped_column(EnumString(EventType), index=True)
+    # Feed messages are one-liners: bounded so they stay inline in the heap
+    # tuple (the migration also sets STORAGE MAIN) instead of moving to TOAST
+    message: Mapped[str] = mapped_column(String(1024))
 
     # Additional metadata (flexible, like details in PipelineStage)
     event_metadata: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
@@ -379,14 +491,13 @@ class Event(Base):
     # ── Optional foreign keys ──
     # An event can be linked to a PR, a pipeline, or both.
     # nullable=True because some events are global.
-    pull_request_id: Mapped[str | None] = mapped_column(
-        UUID(as_uuid=False),
+    pull_request_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("pull_requests.id", ondelete="CASCADE"),
         nullable=True,
-        index=True,
     )
-    pipeline_id: Mapped[str | None] = mapped_column(
-        UUID(as_uuid=False),
+    pipeline_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True),
         ForeignKey("pipelines.id", ondelete="CASCADE"),
         nullable=True,
         index=True,
@@ -404,3 +515,60 @@ class Event(Base):
 
     def __repr__(self) -> str:
         return f"<Event {self.event_type.value} @ {self.created_at}>"
+
+
+# ──────────────────────────────────────────────────────────────
+# Derived mappings
+# ──────────────────────────────────────────────────────────────
+
+# One row per PR: DISTINCT ON keeps the first row of each pull_request_id
+# group, and the ORDER BY makes that row the most recent pipeline.
+# PostgreSQL pushes the "pull_request_id IN (...)" filter emitted by
+# selectinload down into this subquery, so list pages load a single
+# pipeline per PR instead of the whole history.
+_latest_pipelines = (
+    select(Pipeline)
+    .distinct(Pipeline.pull_request_id)
+    .order_by(Pipeline.pull_request_id, Pipeline.created_at.desc())
+    .subquery("latest_pipelines")
+)
+_LatestPipeline = aliased(Pipeline, _latest_pipelines)
+
+PullRequest.latest_pipeline = relationship(
+    _LatestPipeline,
+    primaryjoin=PullRequest.id == _LatestPipeline.pull_request_id,
+    viewonly=True,  # Derived data: never written through this relationship
+    uselist=False,
+)
+
+
+# ──────────────────────────────────────────────────────────────
+# Triggers
+# ──────────────────────────────────────────────────────────────
+
+# pull_requests.updated_at is stamped by PostgreSQL, only when a row really
+# changes (WHEN clause) and unless the UPDATE sets updated_at itself.
+# Attached to the table so Base.metadata.create_all() (tests) installs it too;
+# the Alembic migration installs the same function and trigger.
+_SET_UPDATED_AT = DDL(  # type: ignore[no-untyped-call]  # DDL isn't annotated
+    """
+    CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+            NEW.updated_at := now();
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+_PULL_REQUESTS_UPDATED_AT_TRIGGER = DDL(  # type: ignore[no-untyped-call]  # DDL isn't annotated
+    """
+    CREATE TRIGGER pull_requests_set_updated_at
+    BEFORE UPDATE ON pull_requests
+    FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+    EXECUTE FUNCTION set_updated_at()
+    """
+)
+sa_event.listen(PullRequest.__table__, "after_create", _SET_UPDATED_AT)
+sa_event.listen(PullRequest.__table__, "after_create", _PULL_REQUESTS_UPDATED_AT_TRIGGER)
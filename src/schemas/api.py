@@ -14,8 +14,9 @@ Naming convention:
 
 from datetime import datetime
 from typing import Any
+from uuid import UUID
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, TypeAdapter
 
 from src.models.entities import (
     EnvironmentStatus,
@@ -39,7 +40,7 @@ class PipelineStageResponse(BaseModel):
     # This is what makes PipelineStageResponse.model_validate(stage) work.
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: UUID
     stage_type: StageType
     status: StageStatus
     order: int
@@ -59,7 +60,7 @@ class PipelineResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: UUID
     commit_sha: str
     status: PipelineStatus
     duration_seconds: int | None = None
@@ -74,7 +75,7 @@ class PipelineSummary(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: UUID
     commit_sha: str
     status: PipelineStatus
     duration_seconds: int | None = None
@@ -89,7 +90,7 @@ class PipelineSummary(BaseModel):
 class EnvironmentResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: UUID
     namespace: str
     url: str
     status: EnvironmentStatus
@@ -112,7 +113,7 @@ class PullRequestResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: UUID
     github_pr_number: int
     repository: str
     title: str
@@ -134,7 +135,7 @@ class PullRequestListItem(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: UUID
     github_pr_number: int
     repository: str
     title: str
@@ -159,15 +160,26 @@ class EventResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
-    id: str
+    id: UUID
     event_type: EventType
     message: str
     event_metadata: dict[str, Any] | None = None
-    pull_request_id: str | None = None
-    pipeline_id: str | None = None
+    pull_request_id: UUID | None = None
+    pipeline_id: UUID | None = None
     created_at: datetime
 
 
+# ──────────────────────────────────────────────
+# List adapters
+# ──────────────────────────────────────────────
+# Built once at import: each validates a whole page of ORM objects in a
+# single pydantic-core call instead of one model_validate() per row.
+# Use with from_attributes=True.
+
+PR_LIST_ADAPTER = TypeAdapter(list[PullRequestListItem])
+EVENT_LIST_ADAPTER = TypeAdapter(list[EventResponse])
+
+
 # ──────────────────────────────────────────────
 # Dashboard Stats
 # ──────────────────────────────────────────────
@@ -5,16 +5,27 @@ Using Testcontainers to spin up an ephemeral PostgreSQL database for tests.
 - No port conflicts locally.
 - Identical behavior locally and in CI.
 - Clean, isolated database for every test run.
+
+Set TEST_DATABASE_URL (postgresql+asyncpg://...) to use an already running
+PostgreSQL server instead, and skip the container start on every run. Only
+the server is reused: the tests always create, and finally drop, a scratch
+snapenv_test_* database of their own, never touching the database in the URL.
+
+Tests can run in parallel with pytest-xdist (pytest -n auto): each worker
+gets its own database, so their schemas and transactions never collide.
 """
 
-from collections.abc import AsyncGenerator
+import asyncio
+import os
+from collections.abc import AsyncGenerator, Iterator
 from pathlib import Path
 
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
-from sqlalchemy import NullPool
+from sqlalchemy import NullPool, make_url, text
 from sqlalchemy.ext.asyncio import (
+    AsyncConnection,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
@@ -22,30 +33,82 @@ from sqlalchemy.ext.asyncio import (
 from testcontainers.postgres import PostgresContainer
 
 from src.api.main import app
-from src.models.database import get_db
+from src.api.routes.dashboard import invalidate_stats_cache
+from src.models.database import get_db, get_ro_db
 from src.models.entities import Base
 
+try:
+    import uvloop
+except ImportError:  # Not available on Windows (see the dev dependency marker)
+    uvloop = None  # type: ignore[assignment]
+
 ROOT_DIR = Path(__file__).resolve().parents[1]
 
+# The app reads its settings when it builds its middleware stack (first request).
+# These credentials are never used: every database dependency is overridden below.
+os.environ.setdefault("POSTGRES_USER", "test")
+os.environ.setdefault("POSTGRES_PASSWORD", "test")
+TEST_CORS_ORIGIN = "http://dashboard.test"
+os.environ["CORS_ORIGINS"] = f'["{TEST_CORS_ORIGIN}"]'
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy() -> asyncio.AbstractEventLoopPolicy:
+    """Run the async tests on uvloop, the event loop uvicorn picks in production.
+
+    Falls back to asyncio's default loop where uvloop isn't installed.
+    """
+    if uvloop is None:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
+
 
 @pytest.fixture(scope="session")
-def postgres_container():
-    """Start a PostgreSQL container for the entire test session."""
+def server_url() -> Iterator[str]:
+    """Async URL of the PostgreSQL server, shared by the entire test session.
+
+    Uses TEST_DATABASE_URL when set; otherwise starts a PostgreSQL container.
+    """
+    if url := os.environ.get("TEST_DATABASE_URL"):
+        yield url
+        return
+
     with PostgresContainer("postgres:16-alpine") as postgres:
-        yield postgres
+        # testcontainers returns a sync URL like postgresql+psycopg2://...
+        # We need to replace it with postgresql+asyncpg://...
+        yield postgres.get_connection_url().replace("psycopg2", "asyncpg")
 
 
-@pytest_asyncio.fixture
-async def engine_test(postgres_container):
-    """Create an async SQLAlchemy engine connected to the test container."""
-    # testcontainers returns a sync URL like postgresql+psycopg2://...
-    # We need to replace it with postgresql+asyncpg://...
-    db_url = postgres_container.get_connection_url().replace("psycopg2", "asyncpg")
+@pytest_asyncio.fixture(scope="session")
+async def database_url(server_url: str, worker_id: str) -> AsyncGenerator[str, None]:
+    """Async URL of this process's scratch test database.
+
+    Every pytest process creates and drops a database of its own:
+    snapenv_test_master without xdist, snapenv_test_gw0, _gw1, ... per xdist
+    worker. The suite drops tables and deletes rows, so it must never run in
+    the database the server URL points to (possibly someone's dev database).
+    """
+    name = f"snapenv_test_{worker_id}"
+    # CREATE/DROP DATABASE can't run inside a transaction block
+    admin = create_async_engine(server_url, isolation_level="AUTOCOMMIT", poolclass=NullPool)
+    async with admin.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+        await conn.execute(text(f'CREATE DATABASE "{name}"'))
+
+    yield make_url(server_url).set(database=name).render_as_string(hide_password=False)
+
+    async with admin.connect() as conn:
+        await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}"'))
+    await admin.dispose()
+
 
+@pytest_asyncio.fixture(scope="session")
+async def engine_test(database_url):
+    """Create an async SQLAlchemy engine connected to the test database."""
     # NullPool: each operation gets a fresh connection, no pooling.
     # Slightly slower but eliminates all "another operation in progress" errors.
     engine = create_async_engine(
-        db_url,
+        database_url,
         echo=False,
         poolclass=NullPool,
     )
@@ -53,19 +116,13 @@ async def engine_test(postgres_container):
     await engine.dispose()
 
 
-@pytest_asyncio.fixture
-async def test_session_factory(engine_test):
-    """Create a session factory bound to the test engine."""
-    return async_sessionmaker(
-        bind=engine_test,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
-
-
-@pytest_asyncio.fixture(autouse=True)
+@pytest_asyncio.fixture(scope="session", autouse=True)
 async def setup_database(engine_test) -> AsyncGenerator[None, None]:
-    """Create all tables before each test, drop them after."""
+    """Create all tables once for the session, drop them at the end.
+
+    DDL is the slow part of a test's setup: create_all runs once, and each
+    test's rows are rolled back at teardown (see db_connection below).
+    """
     async with engine_test.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     yield
@@ -73,6 +130,36 @@ async def setup_database(engine_test) -> AsyncGenerator[None, None]:
         await conn.run_sync(Base.metadata.drop_all)
 
 
+@pytest_asyncio.fixture
+async def db_connection(setup_database, engine_test) -> AsyncGenerator[AsyncConnection, None]:
+    """One connection per test, inside a transaction that is rolled back at teardown.
+
+    Nothing a test writes ever reaches the database for good, so every test
+    starts from empty tables without any DDL or TRUNCATE.
+    """
+    async with engine_test.connect() as conn:
+        transaction = await conn.begin()
+        yield conn
+        await transaction.rollback()
+
+
+@pytest_asyncio.fixture
+async def test_session_factory(db_connection):
+    """Create a session factory bound to the test's connection.
+
+    join_transaction_mode="create_savepoint": a session's begin/commit/rollback
+    become SAVEPOINT / RELEASE / ROLLBACK TO inside the outer transaction,
+    so the API's session.commit() never really commits. Tests only need
+    to flush: the API's sessions share the connection and see flushed rows.
+    """
+    return async_sessionmaker(
+        bind=db_connection,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
 @pytest_asyncio.fixture
 async def db_session(test_session_factory) -> AsyncGenerator[AsyncSession, None]:
     """Provide a database session for tests."""
@@ -80,30 +167,40 @@ async def db_session(test_session_factory) -> AsyncGenerator[AsyncSession, None]
         yield session
 
 
+@pytest_asyncio.fixture(scope="session")
+async def http_client() -> AsyncGenerator[AsyncClient, None]:
+    """One HTTP client over the ASGI app, reused by every test.
+
+    The client holds no per-test state: which database a request sees is
+    decided by the dependency overrides installed by the client fixture.
+    """
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+    ) as ac:
+        yield ac
+
+
 @pytest_asyncio.fixture
-async def client(test_session_factory) -> AsyncGenerator[AsyncClient, None]:
+async def client(http_client, test_session_factory) -> AsyncGenerator[AsyncClient, None]:
     """Provide an async HTTP client wired to the test database.
 
-    Override get_db so the API endpoints use our test database.
-    Each API request gets its own session from the same NullPool engine,
-    so there's no connection sharing conflict.
+    Override get_db and get_ro_db so the API endpoints use our test database.
+    Each API request gets its own session on the test's connection, so it
+    sees the rows the test wrote (requests run one at a time, so sharing
+    the connection is safe).
     """
 
     async def override_get_db() -> AsyncGenerator[AsyncSession, None]:
-        async with test_session_factory() as session:
-            try:
-                yield session
-                await session.commit()
-            except Exception:
-                await session.rollback()
-                raise
+        # Same unit of work as src.models.database.get_db
+        async with test_session_factory() as session, session.begin():
+            yield session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_ro_db] = override_get_db
+    # The /stats response is cached in-process; start every test from a cold cache.
+    invalidate_stats_cache()
 
-    async with AsyncClient(
-        transport=ASGITransport(app=app),
-        base_url="http://test",
-    ) as ac:
-        yield ac
+    yield http_client
 
     app.dependency_overrides.clear()
@@ -0,0 +1,79 @@
+"""Tests for the application lifespan in src/api/main.py.
+
+Runs the real startup path (settings → init_db → pool warm-up) against
+the test database, then checks which pool ended up with warm connections.
+"""
+
+from collections.abc import Iterator
+
+import pytest
+from sqlalchemy import make_url
+
+from src.api import main
+from src.api.main import app, lifespan
+from src.models import database
+from src.models.config import get_settings
+
+# ──────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────
+
+_CACHED_GETTERS = (
+    get_settings,
+    database.get_engine,
+    database.get_ro_engine,
+    database.get_session_factory,
+    database.get_ro_session_factory,
+)
+
+
+@pytest.fixture
+def app_settings(database_url: str, monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    """Point the app's settings at the test database, with fresh engines."""
+    url = make_url(database_url)
+    monkeypatch.setenv("POSTGRES_HOST", url.host or "localhost")
+    monkeypatch.setenv("POSTGRES_PORT", str(url.port or 5432))
+    monkeypatch.setenv("POSTGRES_USER", url.username or "")
+    monkeypatch.setenv("POSTGRES_PASSWORD", url.password or "")
+    monkeypatch.setenv("POSTGRES_DB", url.database or "")
+    monkeypatch.setenv("DB_POOL_WARM_UP", "3")
+    for getter in _CACHED_GETTERS:
+        getter.cache_clear()
+    yield
+    for getter in _CACHED_GETTERS:
+        getter.cache_clear()
+
+
+# ──────────────────────────────────────────────
+# Lifespan
+# ──────────────────────────────────────────────
+
+
+@pytest.mark.usefixtures("app_settings")
+class TestLifespan:
+    """Tests for the startup pool warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_warms_read_only_pool(self) -> None:
+        """The read-only pool (used by every route) starts with warm connections."""
+        async with lifespan(app):
+            ro_pool = database.get_ro_engine().pool
+            rw_pool = database.get_engine().pool
+            # Idle connections waiting in each pool
+            assert ro_pool.checkedin() == 3  # type: ignore[attr-defined]
+            assert rw_pool.checkedin() == 0  # type: ignore[attr-defined]
+
+        await database.get_ro_engine().dispose()
+        await database.get_engine().dispose()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_failure_is_not_fatal(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The app still starts when the database can't be reached yet."""
+
+        async def unreachable(*args: object) -> None:
+            raise OSError("connection refused")
+
+        monkeypatch.setattr(main, "warm_up_pool", unreachable)
+
+        async with lifespan(app):
+            assert app.title == get_settings().app_name
@@ -9,10 +9,18 @@ Each test follows the Arrange-Act-Assert pattern:
 We test both "happy paths" (normal usage) and "edge cases" (not found, empty, filters).
 """
 
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import orjson
 import pytest
-from httpx import AsyncClient
+import pytest_asyncio
+from httpx import AsyncClient, Response
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.routes import dashboard
+from src.api.routes.dashboard import invalidate_stats_cache
 from src.models import (
     Environment,
     EnvironmentStatus,
@@ -26,11 +34,53 @@ from src.models import (
     StageStatus,
     StageType,
 )
+from tests.conftest import TEST_CORS_ORIGIN
 
 # ──────────────────────────────────────────────
 # Helpers
 # ──────────────────────────────────────────────
 
+# Placeholder 40-char git SHAs: the PR head commit and the commit a pipeline ran on
+FAKE_HEAD_SHA = "a" * 40
+FAKE_PIPELINE_SHA = "b" * 40
+
+
+def rjson(response: Response) -> Any:
+    """Decode a response body with orjson (faster than httpx's stdlib-based .json())."""
+    return orjson.loads(response.content)
+
+
+def pull_request_values(
+    pr_number: int = 42,
+    status: PRStatus = PRStatus.OPEN,
+    author: str = "alice",
+    title: str = "feat: add login page",
+    branch: str = "feat/login",
+    updated_at: datetime | None = None,
+) -> dict[str, Any]:
+    """Column values for a PullRequest with sensible defaults.
+
+    Pass updated_at to control list ordering explicitly: the column defaults
+    to now(), which is the same for every row written in a test's transaction.
+    """
+    values: dict[str, Any] = {
+        "github_pr_number": pr_number,
+        "repository": "user/repo",
+        "title": title,
+        "author": author,
+        "branch": branch,
+        "base_branch": "main",
+        "status": status,
+        "preview_url": (
+            f"https://snapenv-pr-{pr_number}.preview.example.dev" if status == PRStatus.OPEN else None
+        ),
+        "github_url": f"https://github.com/user/repo/pull/{pr_number}",
+        "latest_commit_sha": FAKE_HEAD_SHA,
+    }
+    if updated_at is not None:
+        values["updated_at"] = updated_at
+    return values
+
 
 async def create_pull_request(
     db: AsyncSession,
@@ -39,24 +89,15 @@ async def create_pull_request(
     author: str = "alice",
     title: str = "feat: add login page",
     branch: str = "feat/login",
+    updated_at: datetime | None = None,
 ) -> PullRequest:
-    """Helper to create a PullRequest with sensible defaults."""
-    pr = PullRequest(
-        github_pr_number=pr_number,
-        repository="user/repo",
-        title=title,
-        author=author,
-        branch=branch,
-        base_branch="main",
-        status=status,
-        preview_url=(
-            f"https://snapenv-pr-{pr_number}.preview.example.dev" if status == PRStatus.OPEN else None
-        ),
-        github_url=f"https://github.com/user/repo/pull/{pr_number}",
-        latest_commit_sha="a" * 40,
-    )
+    """Helper to create a PullRequest with sensible defaults.
+
+    Nothing is sent to the database yet: the INSERT happens at the test's
+    next flush, together with everything else it created.
+    """
+    pr = PullRequest(**pull_request_values(pr_number, status, author, title, branch, updated_at))
     db.add(pr)
-    await db.flush()  # Flush to get the generated ID without committing
     return pr
 
 
@@ -67,14 +108,15 @@ async def create_pipeline(
     duration: int = 120,
 ) -> Pipeline:
     """Helper to create a Pipeline linked to a PR."""
+    # Linking through the relationship (not pull_request_id=pr.id) lets the
+    # PR stay unflushed: SQLAlchemy fills in the foreign key at flush time.
     pipeline = Pipeline(
-        pull_request_id=pr.id,
-        commit_sha="b" * 40,
+        pull_request=pr,
+        commit_sha=FAKE_PIPELINE_SHA,
         status=status,
         duration_seconds=duration,
     )
     db.add(pipeline)
-    await db.flush()
     return pipeline
 
 
@@ -85,17 +127,26 @@ async def create_environment(
 ) -> Environment:
     """Helper to create an Environment linked to a PR."""
     env = Environment(
-        pull_request_id=pr.id,
+        pull_request=pr,
         namespace=f"pr-{pr.github_pr_number}",
         url=f"https://pr-{pr.github_pr_number}.preview.example.dev",
         status=status,
         argocd_app_name=f"preview-pr-{pr.github_pr_number}",
     )
     db.add(env)
-    await db.flush()
     return env
 
 
+async def bulk_create_pull_requests(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert many PullRequests in one INSERT statement (no ORM objects, no flush)."""
+    await db.execute(insert(PullRequest), rows)
+
+
+async def bulk_create_events(db: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Insert many Events in one INSERT statement (no ORM objects, no flush)."""
+    await db.execute(insert(Event), rows)
+
+
 # ──────────────────────────────────────────────
 # Health Check
 # ──────────────────────────────────────────────
@@ -109,7 +160,60 @@ class TestHealthCheck:
         response = await client.get("/health")
 
         assert response.status_code == 200
-        assert response.json() == {"status": "healthy"}
+        assert rjson(response) == {"status": "healthy"}
+
+
+# ──────────────────────────────────────────────
+# Compression
+# ──────────────────────────────────────────────
+
+
+class TestCompression:
+    """Tests for the GZip middleware."""
+
+    @pytest.mark.asyncio
+    async def test_small_response_not_compressed(self, client: AsyncClient) -> None:
+        response = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_large_response_compressed(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        """Large JSON lists are gzipped when the client accepts it."""
+        await bulk_create_pull_requests(db_session, [pull_request_values(pr_number=i + 1) for i in range(5)])
+        await db_session.flush()
+
+        response = await client.get("/api/pull-requests", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        # httpx transparently decompresses the body
+        assert len(rjson(response)) == 5
+
+
+# ──────────────────────────────────────────────
+# CORS
+# ──────────────────────────────────────────────
+
+
+class TestCors:
+    """Tests for the CORS middleware (origins from settings.cors_origins)."""
+
+    @pytest.mark.asyncio
+    async def test_configured_origin_allowed(self, client: AsyncClient) -> None:
+        response = await client.get("/health", headers={"Origin": TEST_CORS_ORIGIN})
+
+        assert response.headers["access-control-allow-origin"] == TEST_CORS_ORIGIN
+
+    @pytest.mark.asyncio
+    async def test_other_origin_rejected(self, client: AsyncClient) -> None:
+        response = await client.options(
+            "/api/pull-requests",
+            headers={"Origin": "https://evil.example", "Access-Control-Request-Method": "GET"},
+        )
+
+        assert response.status_code == 400
+        assert "access-control-allow-origin" not in response.headers
 
 
 # ──────────────────────────────────────────────
@@ -126,91 +230,99 @@ class TestListPullRequests:
         response = await client.get("/api/pull-requests")
 
         assert response.status_code == 200
-        assert response.json() == []
+        assert rjson(response) == []
 
     @pytest.mark.asyncio
-    async def test_returns_prs_with_environment(self, client: AsyncClient, db_session: AsyncSession) -> None:
-        """Returns PRs with their associated environment."""
+    async def test_returns_prs_with_environment_and_latest_pipeline(
+        self, client: AsyncClient, db_session: AsyncSession
+    ) -> None:
+        """Returns PRs with their environment and their most recent pipeline."""
+        now = datetime.now(UTC)
         pr = await create_pull_request(db_session)
         await create_environment(db_session, pr)
-        await db_session.commit()
+        older = await create_pipeline(db_session, pr, PipelineStatus.FAILED)
+        newer = await create_pipeline(db_session, pr, PipelineStatus.SUCCESS)
+        # created_at defaults to now(), which is constant within the test's transaction
+        older.created_at = now - timedelta(hours=2)
+        newer.created_at = now - timedelta(hours=1)
+        await db_session.flush()
 
         response = await client.get("/api/pull-requests")
 
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert len(data) == 1
         assert data[0]["github_pr_number"] == 42
         assert data[0]["author"] == "alice"
         assert data[0]["environment"]["status"] == "running"
         assert data[0]["environment"]["namespace"] == "pr-42"
+        assert data[0]["latest_pipeline"]["status"] == "success"
 
     @pytest.mark.asyncio
-    async def test_returns_latest_pipeline(self, client: AsyncClient, db_session: AsyncSession) -> None:
-        """Includes the most recent pipeline in the response."""
-        pr = await create_pull_request(db_session)
-        await create_pipeline(db_session, pr, PipelineStatus.FAILED)
-        await create_pipeline(db_session, pr, PipelineStatus.SUCCESS)
-        await db_session.commit()
+    async def test_latest_pipeline_is_per_pr(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        """Each PR gets its own most recent pipeline, not another PR's."""
+        now = datetime.now(UTC)
+        pr1 = await create_pull_request(db_session, pr_number=1)
+        pr2 = await create_pull_request(db_session, pr_number=2)
+        old = await create_pipeline(db_session, pr1, PipelineStatus.FAILED)
+        new = await create_pipeline(db_session, pr1, PipelineStatus.SUCCESS)
+        other = await create_pipeline(db_session, pr2, PipelineStatus.RUNNING)
+        # created_at defaults to now(), which is constant within a transaction
+        old.created_at = now - timedelta(hours=2)
+        new.created_at = now - timedelta(hours=1)
+        other.created_at = now - timedelta(hours=3)
+        await db_session.flush()
 
         response = await client.get("/api/pull-requests")
 
-        data = response.json()
-        assert len(data) == 1
-        # latest_pipeline should be present (most recent)
-        assert data[0]["latest_pipeline"] is not None
-        assert data[0]["latest_pipeline"]["status"] in ["success", "failed"]
-
-    @pytest.mark.asyncio
-    async def test_filter_by_status(self, client: AsyncClient, db_session: AsyncSession) -> None:
-        """Filters PRs by status query parameter."""
-        await create_pull_request(db_session, pr_number=1, status=PRStatus.OPEN)
-        await create_pull_request(db_session, pr_number=2, status=PRStatus.OPEN)
-        await create_pull_request(db_session, pr_number=3, status=PRStatus.MERGED)
-        await db_session.commit()
-
-        response = await client.get("/api/pull-requests?status=open")
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data) == 2
-        assert all(pr["status"] == "open" for pr in data)
-
-    @pytest.mark.asyncio
-    async def test_pagination(self, client: AsyncClient, db_session: AsyncSession) -> None:
-        """Respects limit and offset parameters."""
-        for i in range(5):
-            await create_pull_request(db_session, pr_number=i + 1)
-        await db_session.commit()
+        latest = {pr["github_pr_number"]: pr["latest_pipeline"]["status"] for pr in rjson(response)}
+        assert latest == {1: "success", 2: "running"}
+
+
+# PR list scenarios all use the same seed: PRs #1..#5, updated an hour apart
+# (#5 most recently), with #3 merged and #4 closed.
+SEEDED_PR_STATUSES = {
+    1: PRStatus.OPEN,
+    2: PRStatus.OPEN,
+    3: PRStatus.MERGED,
+    4: PRStatus.CLOSED,
+    5: PRStatus.OPEN,
+}
+
+
+@pytest_asyncio.fixture
+async def seeded_prs(db_session: AsyncSession) -> None:
+    """Insert the seed PRs inside the test's transaction (one INSERT, rolled back after)."""
+    base = datetime(2025, 1, 1, tzinfo=UTC)
+    await bulk_create_pull_requests(
+        db_session,
+        [
+            pull_request_values(pr_number=number, status=status, updated_at=base + timedelta(hours=number))
+            for number, status in SEEDED_PR_STATUSES.items()
+        ],
+    )
 
-        response = await client.get("/api/pull-requests?limit=2&offset=0")
-        assert len(response.json()) == 2
 
-        response = await client.get("/api/pull-requests?limit=2&offset=3")
-        assert len(response.json()) == 2
+@pytest.mark.usefixtures("seeded_prs")
+class TestListPullRequestVariants:
+    """Filtering, pagination and ordering of GET /api/pull-requests."""
 
     @pytest.mark.asyncio
-    async def test_ordered_by_most_recent(self, client: AsyncClient, db_session: AsyncSession) -> None:
-        """PRs are returned most recent first."""
-        await create_pull_request(db_session, pr_number=1, title="first")
-        await db_session.commit()
-
-        # Small delay to check that both are returned
-        # and that the endpoint doesn't crash. For deterministic ordering,
-        # we update pr1 so its updated_at is older.
-        pr2 = await create_pull_request(db_session, pr_number=2, title="second")
-        await db_session.commit()
-
-        # Force pr2 to have a newer updated_at by updating it
-        pr2.title = "second updated"
-        await db_session.commit()
-
-        response = await client.get("/api/pull-requests")
-        data = response.json()
+    @pytest.mark.parametrize(
+        ("query", "expected_numbers"),
+        [
+            ("", [5, 4, 3, 2, 1]),  # most recently updated first
+            ("?status=open", [5, 2, 1]),
+            ("?status=merged", [3]),
+            ("?limit=2&offset=0", [5, 4]),
+            ("?limit=2&offset=3", [2, 1]),
+        ],
+    )
+    async def test_list_variants(self, client: AsyncClient, query: str, expected_numbers: list[int]) -> None:
+        response = await client.get(f"/api/pull-requests{query}")
 
-        # PR2 was updated last, so it should be first
-        assert data[0]["github_pr_number"] == 2
-        assert data[1]["github_pr_number"] == 1
+        assert response.status_code == 200
+        assert [pr["github_pr_number"] for pr in rjson(response)] == expected_numbers
 
 
 class TestGetPullRequest:
@@ -222,12 +334,12 @@ class TestGetPullRequest:
         pr = await create_pull_request(db_session)
         await create_environment(db_session, pr)
         await create_pipeline(db_session, pr)
-        await db_session.commit()
+        await db_session.flush()
 
         response = await client.get(f"/api/pull-requests/{pr.id}")
 
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["github_pr_number"] == 42
         assert data["environment"] is not None
         assert len(data["pipelines"]) == 1
@@ -238,7 +350,14 @@ class TestGetPullRequest:
         response = await client.get("/api/pull-requests/00000000-0000-0000-0000-000000000000")
 
         assert response.status_code == 404
-        assert "not found" in response.json()["detail"].lower()
+        assert "not found" in rjson(response)["detail"].lower()
+
+    @pytest.mark.asyncio
+    async def test_invalid_id(self, client: AsyncClient) -> None:
+        """Rejects a malformed UUID before querying the database."""
+        response = await client.get("/api/pull-requests/not-a-uuid")
+
+        assert response.status_code == 422
 
 
 # ──────────────────────────────────────────────
@@ -258,7 +377,7 @@ class TestGetPipeline:
         # Add stages
         stages = [
             PipelineStage(
-                pipeline_id=pipeline.id,
+                pipeline=pipeline,
                 stage_type=StageType.LINT,
                 status=StageStatus.SUCCESS,
                 order=1,
@@ -266,7 +385,7 @@ class TestGetPipeline:
                 duration_seconds=8,
             ),
             PipelineStage(
-                pipeline_id=pipeline.id,
+                pipeline=pipeline,
                 stage_type=StageType.TEST,
                 status=StageStatus.SUCCESS,
                 order=2,
@@ -274,19 +393,19 @@ class TestGetPipeline:
                 duration_seconds=45,
             ),
             PipelineStage(
-                pipeline_id=pipeline.id,
+                pipeline=pipeline,
                 stage_type=StageType.BUILD_IMAGE,
                 status=StageStatus.RUNNING,
                 order=3,
             ),
         ]
         db_session.add_all(stages)
-        await db_session.commit()
+        await db_session.flush()
 
         response = await client.get(f"/api/pipelines/{pipeline.id}")
 
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["status"] == "success"
         assert len(data["stages"]) == 3
         # Stages should be ordered by their `order` field
@@ -319,7 +438,7 @@ class TestListEvents:
         response = await client.get("/api/events")
 
         assert response.status_code == 200
-        assert response.json() == []
+        assert rjson(response) == []
 
     @pytest.mark.asyncio
     async def test_returns_events(self, client: AsyncClient, db_session: AsyncSession) -> None:
@@ -329,21 +448,21 @@ class TestListEvents:
             Event(
                 event_type=EventType.PR_OPENED,
                 message=f"PR #{pr.github_pr_number} opened",
-                pull_request_id=pr.id,
+                pull_request=pr,
             ),
             Event(
                 event_type=EventType.PIPELINE_STARTED,
                 message=f"Pipeline started for PR #{pr.github_pr_number}",
-                pull_request_id=pr.id,
+                pull_request=pr,
             ),
         ]
         db_session.add_all(events)
-        await db_session.commit()
+        await db_session.flush()
 
         response = await client.get("/api/events")
 
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert len(data) == 2
 
     @pytest.mark.asyncio
@@ -356,43 +475,47 @@ class TestListEvents:
             Event(
                 event_type=EventType.PR_OPENED,
                 message="PR #1 opened",
-                pull_request_id=pr1.id,
+                pull_request=pr1,
             )
         )
         db_session.add(
             Event(
                 event_type=EventType.PR_OPENED,
                 message="PR #2 opened",
-                pull_request_id=pr2.id,
+                pull_request=pr2,
             )
         )
-        await db_session.commit()
+        await db_session.flush()
 
         response = await client.get(f"/api/events?pull_request_id={pr1.id}")
 
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert len(data) == 1
-        assert data[0]["pull_request_id"] == pr1.id
+        assert data[0]["pull_request_id"] == str(pr1.id)
 
     @pytest.mark.asyncio
     async def test_respects_limit(self, client: AsyncClient, db_session: AsyncSession) -> None:
         """Respects the limit query parameter."""
         pr = await create_pull_request(db_session)
-        for i in range(10):
-            db_session.add(
-                Event(
-                    event_type=EventType.STAGE_COMPLETED,
-                    message=f"Stage {i} completed",
-                    pull_request_id=pr.id,
-                )
-            )
-        await db_session.commit()
+        await db_session.flush()  # The bulk INSERT below needs pr.id
+        await bulk_create_events(
+            db_session,
+            [
+                {
+                    "event_type": EventType.STAGE_COMPLETED,
+                    "message": f"Stage {i} completed",
+                    "pull_request_id": pr.id,
+                }
+                for i in range(10)
+            ],
+        )
+        await db_session.flush()
 
         response = await client.get("/api/events?limit=3")
 
         assert response.status_code == 200
-        assert len(response.json()) == 3
+        assert len(rjson(response)) == 3
 
 
 # ──────────────────────────────────────────────
@@ -409,7 +532,7 @@ class TestPlatformStats:
         response = await client.get("/api/stats")
 
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["active_environments"] == 0
         assert data["total_pull_requests"] == 0
         assert data["open_pull_requests"] == 0
@@ -433,12 +556,12 @@ class TestPlatformStats:
         await create_pipeline(db_session, pr2, PipelineStatus.SUCCESS, duration=200)
         await create_pipeline(db_session, pr3, PipelineStatus.FAILED)
 
-        await db_session.commit()
+        await db_session.flush()
 
         response = await client.get("/api/stats")
 
         assert response.status_code == 200
-        data = response.json()
+        data = rjson(response)
         assert data["active_environments"] == 1
         assert data["total_pull_requests"] == 3
         assert data["open_pull_requests"] == 2
@@ -447,3 +570,88 @@ class TestPlatformStats:
         assert data["success_rate_percent"] == pytest.approx(66.7, abs=0.1)
         # Average of 100 and 200 = 150.0
         assert data["avg_deploy_time_seconds"] == 150.0
+
+    @pytest.mark.asyncio
+    async def test_stats_are_cached(self, client: AsyncClient, db_session: AsyncSession) -> None:
+        """Serves cached stats until the cache is invalidated."""
+        response = await client.get("/api/stats")
+        assert rjson(response)["total_pull_requests"] == 0
+
+        await create_pull_request(db_session)
+        await db_session.flush()
+
+        # Still within the TTL: the cached value is returned
+        response = await client.get("/api/stats")
+        assert rjson(response)["total_pull_requests"] == 0
+
+        invalidate_stats_cache()
+        response = await client.get("/api/stats")
+        assert rjson(response)["total_pull_requests"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidated_during_compute_not_cached(
+        self, client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Stats computed across an invalidation are returned but not cached."""
+        compute = dashboard._compute_platform_stats
+
+        async def compute_then_invalidate(db: AsyncSession) -> Any:
+            stats = await compute(db)
+            invalidate_stats_cache()  # An event is broadcast while the query runs
+            return stats
+
+        monkeypatch.setattr(dashboard, "_compute_platform_stats", compute_then_invalidate)
+
+        response = await client.get("/api/stats")
+
+        assert response.status_code == 200
+        assert dashboard._get_cached_stats() is None
+
+
+# ──────────────────────────────────────────────
+# Models
+# ──────────────────────────────────────────────
+
+
+class TestPullRequestUpdatedAt:
+    """The pull_requests_set_updated_at trigger maintains updated_at on UPDATE."""
+
+    OLD = datetime(2025, 1, 1, tzinfo=UTC)
+
+    @pytest.mark.asyncio
+    async def test_update_bumps_updated_at(self, db_session: AsyncSession) -> None:
+        """A real change moves updated_at forward; eager_defaults loads it on flush."""
+        pr = await create_pull_request(db_session, updated_at=self.OLD)
+        await db_session.flush()
+
+        pr.title = "feat: add login page (v2)"
+        await db_session.flush()
+
+        # Read straight from the instance: an expired attribute would need a
+        # lazy load, which raises under AsyncSession instead of returning.
+        assert pr.updated_at > self.OLD
+
+    @pytest.mark.asyncio
+    async def test_no_op_update_keeps_updated_at(self, db_session: AsyncSession) -> None:
+        """An UPDATE that changes nothing leaves updated_at alone."""
+        pr = await create_pull_request(db_session, updated_at=self.OLD)
+        await db_session.flush()
+
+        await db_session.execute(update(PullRequest).where(PullRequest.id == pr.id).values(title=pr.title))
+
+        updated_at = await db_session.scalar(select(PullRequest.updated_at).where(PullRequest.id == pr.id))
+        assert updated_at == self.OLD
+
+    @pytest.mark.asyncio
+    async def test_explicit_updated_at_is_kept(self, db_session: AsyncSession) -> None:
+        """A caller-supplied updated_at wins over the trigger."""
+        pr = await create_pull_request(db_session, updated_at=self.OLD)
+        await db_session.flush()
+
+        explicit = datetime(2025, 6, 1, tzinfo=UTC)
+        pr.title = "feat: add login page (v2)"
+        pr.updated_at = explicit
+        await db_session.flush()
+
+        updated_at = await db_session.scalar(select(PullRequest.updated_at).where(PullRequest.id == pr.id))
+        assert updated_at == explicit
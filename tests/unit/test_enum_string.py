@@ -0,0 +1,31 @@
+"""Tests for the EnumString column type in src/models/entities.py."""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.models.entities import EnumString, PipelineStatus
+
+DIALECT = postgresql.dialect()
+
+
+def test_stores_enum_value() -> None:
+    """Enum members (and their raw values) are stored as the lowercase value."""
+    column_type = EnumString(PipelineStatus)
+
+    assert column_type.process_bind_param(PipelineStatus.SUCCESS, DIALECT) == "success"
+    assert column_type.process_bind_param("failed", DIALECT) == "failed"
+    assert column_type.process_bind_param(None, DIALECT) is None
+
+
+def test_loads_enum_member() -> None:
+    """Stored strings come back as enum members."""
+    column_type = EnumString(PipelineStatus)
+
+    assert column_type.process_result_value("running", DIALECT) is PipelineStatus.RUNNING
+    assert column_type.process_result_value(None, DIALECT) is None
+
+
+def test_rejects_unknown_value() -> None:
+    """Values outside the enum never reach the database."""
+    with pytest.raises(ValueError):
+        EnumString(PipelineStatus).process_bind_param("bogus", DIALECT)
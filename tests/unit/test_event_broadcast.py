@@ -0,0 +1,111 @@
+"""Tests for the WebSocket event fan-out in src/api/routes/events.py.
+
+Uses a fake WebSocket that records what it receives,
+so the fan-out logic is tested without a real connection.
+"""
+
+import asyncio
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest
+import pytest_asyncio
+
+from src.api.routes import dashboard, events
+from src.api.routes.events import broadcast_event, connected_clients
+from src.schemas.api import PlatformStats
+
+# ──────────────────────────────────────────────
+# Helpers
+# ──────────────────────────────────────────────
+
+
+class FakeWebSocket:
+    """Minimal stand-in for starlette's WebSocket."""
+
+    def __init__(self) -> None:
+        self.sent: list[str] = []
+        self.close_code: int | None = None
+
+    async def send_text(self, data: str) -> None:
+        self.sent.append(data)
+
+    async def close(self, code: int = 1000) -> None:
+        self.close_code = code
+
+
+@pytest_asyncio.fixture
+async def register() -> AsyncGenerator[Any, None]:
+    """Register fake clients with a running writer task, like event_websocket does."""
+    writers: list[asyncio.Task[None]] = []
+
+    def _register(ws: FakeWebSocket, maxsize: int = events.CLIENT_QUEUE_SIZE) -> asyncio.Queue[str | None]:
+        queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=maxsize)
+        connected_clients[ws] = queue
+        writers.append(asyncio.create_task(events._client_writer(ws, queue)))
+        return queue
+
+    yield _register
+
+    for writer in writers:
+        writer.cancel()
+    connected_clients.clear()
+
+
+# ──────────────────────────────────────────────
+# Broadcast
+# ──────────────────────────────────────────────
+
+
+class TestBroadcastEvent:
+    """Tests for broadcast_event()."""
+
+    @pytest.mark.asyncio
+    async def test_sends_to_every_client(self, register: Any) -> None:
+        """Every connected client receives the serialized event."""
+        clients = [FakeWebSocket(), FakeWebSocket()]
+        for ws in clients:
+            register(ws)
+
+        await broadcast_event({"event_type": "pr_opened", "pr_number": 42})
+        await asyncio.sleep(0)  # Let the writer tasks run
+
+        for ws in clients:
+            assert ws.sent == ['{"event_type":"pr_opened","pr_number":42}']
+
+    @pytest.mark.asyncio
+    async def test_slow_client_is_disconnected(self, register: Any) -> None:
+        """A client whose outbox overflows is closed without affecting the others."""
+        fast = FakeWebSocket()
+        slow = FakeWebSocket()
+        register(fast)
+        # Fill the slow client's outbox without giving its writer a chance to drain it
+        slow_queue: asyncio.Queue[str | None] = asyncio.Queue(maxsize=1)
+        connected_clients[slow] = slow_queue
+        slow_queue.put_nowait("backlog")
+
+        await broadcast_event({"event_type": "env_ready"})
+
+        assert slow not in connected_clients
+        # The backlog was dropped and replaced by the close sentinel
+        assert slow_queue.get_nowait() is None
+
+        await asyncio.sleep(0)
+        assert fast in connected_clients
+        assert len(fast.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidates_stats_cache(self) -> None:
+        """A broadcast drops the cached /api/stats response."""
+        dashboard._cached_stats = PlatformStats(
+            active_environments=0,
+            total_pull_requests=0,
+            open_pull_requests=0,
+            pipelines_today=0,
+            success_rate_percent=0.0,
+        )
+        dashboard._cached_until = float("inf")
+
+        await broadcast_event({"event_type": "pr_opened"})
+
+        assert dashboard._get_cached_stats() is None